@@ -2,14 +2,22 @@
 
 import json
 import os
+import re
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import TYPE_CHECKING
 
 from emmet.core.phonon import PhononBSDOSDoc
 from monty.io import zopen
 from monty.json import MontyEncoder
 from mp_api.client import MPRester
+from pymatviz.enums import Key
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from ffonons import DATA_DIR
+from ffonons.io import glob_ph_docs, load_json
 
 if TYPE_CHECKING:
     from pymatgen.core import Structure
@@ -17,6 +25,49 @@ if TYPE_CHECKING:
 __author__ = "Janosh Riebesell"
 __date__ = "2023-12-07"
 
+# retry rate-limited (429) and transient gateway errors with exponential backoff
+# instead of aborting long download loops
+MP_RETRY = Retry(
+    total=5,
+    backoff_factor=2,
+    status_forcelist=[429, 502, 503, 504],
+    respect_retry_after_header=True,
+)
+
+
+def _get_mp_rester() -> MPRester:
+    """Get an MPRester whose session retries rate-limited and failed requests with
+    exponential backoff. The session is shared with all sub-resters like
+    MPRester.materials.phonon.
+    """
+    mp_rester = MPRester(mute_progress_bars=True)
+    adapter = HTTPAdapter(max_retries=MP_RETRY)
+    for prefix in ("http://", "https://"):
+        mp_rester.session.mount(prefix, adapter)
+    return mp_rester
+
+
+def _find_mp_ph_doc(mp_id: str, docs_dir: str) -> str | None:
+    """Find the saved MP phonon doc for a material in docs_dir.
+
+    MP docs are saved as {mp_id}-{formula}-pbe.json.xz (older ones without the -pbe
+    suffix, possibly recompressed by convert_docs_to_zstd) and may share a directory
+    with ML docs named {mp_id}-{formula}-{model}.json.*, so a plain {mp_id}-* glob
+    isn't enough.
+
+    Args:
+        mp_id (str): Material ID.
+        docs_dir (str): Directory to search.
+
+    Returns:
+        str | None: Path to the MP phonon doc or None if not found.
+    """
+    mp_doc_regex = re.compile(rf"{re.escape(mp_id)}-[^-]+(-pbe)?\.json(\.\w+)?")
+    for path in glob_ph_docs(docs_dir, glob_patt=f"{mp_id}-*.json*"):
+        if mp_doc_regex.fullmatch(os.path.basename(path)):
+            return path
+    return None
+
 
 def get_mp_ph_docs(
     mp_id: str, docs_dir: str = f"{DATA_DIR}/mp"
@@ -31,19 +82,92 @@ def get_mp_ph_docs(
     Returns:
         tuple[PhononBSDOSDoc, str]: Phonon doc and path to saved doc.
     """
-    mp_rester = MPRester(mute_progress_bars=True)
+    # skip querying MP for the structure (only needed for the formula in the file
+    # name) if the doc is already on disk
+    if docs_dir and (mp_ph_doc_path := _find_mp_ph_doc(mp_id, docs_dir)):
+        return load_json(mp_ph_doc_path), mp_ph_doc_path
+
+    mp_rester = _get_mp_rester()
     struct: Structure = mp_rester.get_structure_by_material_id(mp_id)
 
     id_formula = f"{mp_id}-{struct.formula.replace(' ', '')}"
-    mp_ph_doc_path = f"{docs_dir}/{id_formula}.json.xz" if docs_dir else ""
+    mp_ph_doc_path = f"{docs_dir}/{id_formula}-pbe.json.xz" if docs_dir else ""
 
-    if os.path.isfile(mp_ph_doc_path):
-        with zopen(mp_ph_doc_path, mode="rt") as file:
-            mp_phonon_doc = json.load(file)
-    else:
-        mp_phonon_doc = mp_rester.materials.phonon.get_data_by_id(mp_id)
-        if mp_ph_doc_path:
-            with zopen(mp_ph_doc_path, mode="wt") as file:
-                json.dump(mp_phonon_doc, file, cls=MontyEncoder)
+    mp_phonon_doc = mp_rester.materials.phonon.get_data_by_id(mp_id)
+    if mp_ph_doc_path:
+        with zopen(mp_ph_doc_path, mode="wt") as file:
+            json.dump(mp_phonon_doc, file, cls=MontyEncoder)
 
     return mp_phonon_doc, mp_ph_doc_path
+
+
+def _fetch_mp_ph_docs_chunk(mp_ids: Sequence[str], docs_dir: str) -> dict[str, str]:
+    """Fetch phonon docs and formulas for a chunk of material IDs from MP and save the
+    docs to disk. Creates its own MPRester so it can run in a worker thread.
+    """
+    mp_rester = _get_mp_rester()
+    summary_docs = mp_rester.materials.summary.search(
+        material_ids=list(mp_ids), fields=[Key.mat_id, "structure"]
+    )
+    formulas = {
+        str(doc.material_id): doc.structure.formula.replace(" ", "")
+        for doc in summary_docs
+    }
+    ph_docs = mp_rester.materials.phonon.search(material_ids=list(mp_ids))
+
+    doc_paths: dict[str, str] = {}
+    for ph_doc in ph_docs:
+        mp_id = str(ph_doc.material_id)
+        if mp_id not in formulas:
+            continue
+        mp_ph_doc_path = f"{docs_dir}/{mp_id}-{formulas[mp_id]}-pbe.json.xz"
+        with zopen(mp_ph_doc_path, mode="wt") as file:
+            json.dump(ph_doc, file, cls=MontyEncoder)
+        doc_paths[mp_id] = mp_ph_doc_path
+
+    return doc_paths
+
+
+def get_mp_ph_docs_bulk(
+    mp_ids: Sequence[str],
+    docs_dir: str = f"{DATA_DIR}/mp",
+    *,
+    chunk_size: int = 100,
+    max_workers: int = 8,
+) -> dict[str, str]:
+    """Fetch phonon docs for many materials from MP in bulk queries and save them to
+    disk. Materials with an existing doc in docs_dir are not re-fetched.
+
+    Args:
+        mp_ids (Sequence[str]): Material IDs.
+        docs_dir (str): Directory to save the MP phonon docs. Defaults to
+            f"{DATA_DIR}/mp".
+        chunk_size (int): Number of material IDs per query. Defaults to 100.
+        max_workers (int): Max number of chunks to fetch concurrently. Defaults to 8.
+
+    Returns:
+        dict[str, str]: Map from material ID to path of its (existing or newly saved)
+            phonon doc. IDs for which MP has no phonon doc are omitted.
+    """
+    os.makedirs(docs_dir, exist_ok=True)
+
+    doc_paths: dict[str, str] = {}
+    for mp_id in mp_ids:
+        if existing_path := _find_mp_ph_doc(mp_id, docs_dir):
+            doc_paths[mp_id] = existing_path
+
+    missing_ids = [mp_id for mp_id in mp_ids if mp_id not in doc_paths]
+    chunks = [
+        missing_ids[idx : idx + chunk_size]
+        for idx in range(0, len(missing_ids), chunk_size)
+    ]
+    if not chunks:
+        return doc_paths
+
+    # queries are network-bound so overlap them in threads
+    fetch_chunk = partial(_fetch_mp_ph_docs_chunk, docs_dir=docs_dir)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        for chunk_doc_paths in executor.map(fetch_chunk, chunks):
+            doc_paths |= chunk_doc_paths
+
+    return doc_paths
@@ -36,6 +36,7 @@ from pymatgen.symmetry.kpath import KPathSeek
 
 from ffonons import DATA_DIR
 from ffonons.enums import DB, KpathScheme, PhKey
+from ffonons.io import glob_ph_docs
 
 __author__ = "Janine George, Aakash Naik, Janosh Riebesell"
 __date__ = "2023-12-07"
@@ -170,8 +171,13 @@ def phonondb_doc_to_pmg_lzma(
     """
     mat_id = "-".join(zip_path.split("/")[-1].split("-")[:2])
 
-    doc_path_patt = pmg_doc_path or f"{ph_docs_dir}/{mat_id}-*-pbe.json.xz"
-    if matches := glob(doc_path_patt):
+    # existing docs may have been recompressed by convert_docs_to_zstd
+    matches = (
+        glob(pmg_doc_path)
+        if pmg_doc_path
+        else glob_ph_docs(ph_docs_dir, glob_patt=f"{mat_id}-*-pbe.json.*")
+    )
+    if matches:
         if existing == "skip-silent":
             return matches[0]
         if existing == "skip":
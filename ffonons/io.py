@@ -2,38 +2,150 @@
 band structures and DOSs from disk.
 """
 
+import io
 import json
 import os
 import re
 from collections import defaultdict
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from glob import glob
 from pathlib import Path
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Any, Literal
 from zipfile import ZipFile
 
 import numpy as np
+import orjson
 import pandas as pd
-from atomate2.common.schemas.phonons import PhononBSDOSDoc
+import zstandard
 from monty.io import zopen
-from monty.json import MontyDecoder
+from monty.json import MontyDecoder, MontyEncoder
 from pymatgen.core import Structure
 from pymatviz.enums import Key
 from tqdm import tqdm
 
 from ffonons.enums import DB, PhKey
 
+# atomate2 pulls in phonopy and emmet which take ~1s to import, only needed for type
+# hints since MontyDecoder resolves doc classes from their @module/@class keys
 if TYPE_CHECKING:
+    from atomate2.common.schemas.phonons import PhononBSDOSDoc
+
     from ffonons.dbs.phonondb import PhononDBDocParsed
 else:
-    PhononDBDocParsed = object
+    PhononBSDOSDoc = PhononDBDocParsed = object
 
 __author__ = "Janosh Riebesell"
 __date__ = "2023-11-24"
 
 
 PhDocs = dict[str, dict[str, PhononBSDOSDoc | PhononDBDocParsed]]
+# matches doc file names like mp-149-Si2-mace-y7uhwpje.json.xz, capturing material ID,
+# formula and model. [^/] classes keep matches within the file name and avoid
+# backtracking across directories
+PH_DOC_PATH_REGEX = re.compile(r"(mp-\d+)-([A-Z][^-/]+)-([^/]+?)\.json(?:\.\w+)?$")
+
+
+def load_json(path: str) -> Any:
+    """Load a (optionally compressed) JSON file.
+
+    Parses with orjson which is several times faster than json for large phonon
+    band structure and DOS docs. Falls back to json for files containing NaN or
+    Infinity which orjson rejects.
+
+    Args:
+        path (str): Path to JSON file. Compression is inferred from the extension.
+            Supports .zst (Zstandard) in addition to the formats handled by zopen.
+
+    Returns:
+        Any: Parsed JSON. MSONable objects are not decoded, pass the result to
+            MontyDecoder().process_decoded() for that.
+    """
+    if path.endswith(".zst"):
+        with open(path, mode="rb") as file:
+            json_bytes = zstandard.ZstdDecompressor().stream_reader(file).readall()
+    else:
+        with zopen(path, mode="rb") as file:
+            json_bytes = file.read()
+    try:
+        return orjson.loads(json_bytes)
+    except orjson.JSONDecodeError:
+        return json.loads(json_bytes)
+
+
+def save_json_zst(obj: Any, path: str, level: int = 9) -> None:
+    """Save an object as Zstandard-compressed JSON. Zstandard decompresses several
+    times faster than gzip or xz at similar compression ratio.
+
+    Args:
+        obj (Any): JSON-serializable or MSONable object.
+        path (str): Output path, should end in .json.zst.
+        level (int): Zstandard compression level. Defaults to 9.
+    """
+    compressor = zstandard.ZstdCompressor(level=level)
+    with (
+        open(path, mode="wb") as file,
+        compressor.stream_writer(file) as writer,
+        io.TextIOWrapper(writer, encoding="utf-8") as text_writer,
+    ):
+        json.dump(obj, text_writer, cls=MontyEncoder)
+
+
+def glob_ph_docs(directory: str, glob_patt: str = "*.json.*") -> list[str]:
+    """List phonon doc paths in a directory, keeping only one file per doc.
+
+    After convert_docs_to_zstd(remove_old=False), docs exist as both .json.xz and
+    .json.zst. Loading both would decode every doc twice, so for each doc the
+    preferred extension is kept (.zst > .xz > .gz > anything else).
+
+    Args:
+        directory (str): Directory to search.
+        glob_patt (str): Glob pattern for file names. Defaults to "*.json.*".
+
+    Returns:
+        list[str]: Sorted paths with at most one file per doc.
+    """
+    ext_priority = (".zst", ".xz", ".gz")
+    best_paths: dict[str, tuple[int, str]] = {}
+    for path in glob(f"{directory}/{glob_patt}"):
+        doc_stem, dot_json, ext = path.rpartition(".json")
+        if not dot_json:
+            continue
+        rank = ext_priority.index(ext) if ext in ext_priority else len(ext_priority)
+        if doc_stem not in best_paths or rank < best_paths[doc_stem][0]:
+            best_paths[doc_stem] = (rank, path)
+    return sorted(path for _rank, path in best_paths.values())
+
+
+def convert_docs_to_zstd(directory: str, *, remove_old: bool = False) -> list[str]:
+    """Re-compress all .json.gz and .json.xz docs in a directory as .json.zst.
+    If the originals are kept, glob_ph_docs() ignores them in favor of the .zst.
+
+    Args:
+        directory (str): Path to the directory containing the phonon docs.
+        remove_old (bool): Whether to delete the original files after conversion.
+            Defaults to False.
+
+    Returns:
+        list[str]: Paths to the new .json.zst files.
+    """
+    paths = glob(f"{directory}/*.json.gz") + glob(f"{directory}/*.json.xz")
+    compressor = zstandard.ZstdCompressor(level=9)
+
+    zst_paths = []
+    for path in tqdm(paths, desc="Converting docs to zstd"):
+        zst_path = f"{path.rsplit('.', 1)[0]}.zst"
+        if not os.path.isfile(zst_path):
+            with zopen(path, mode="rb") as file:
+                json_bytes = file.read()
+            with open(zst_path, mode="wb") as file:
+                file.write(compressor.compress(json_bytes))
+        if remove_old:
+            os.remove(path)
+        zst_paths += [zst_path]
+
+    return zst_paths
 
 
 def load_pymatgen_phonon_docs(
@@ -42,6 +154,7 @@ def load_pymatgen_phonon_docs(
     materials_ids: Sequence[str] = (),
     glob_patt: str = "",
     verbose: bool = True,
+    max_workers: int | None = None,
 ) -> PhDocs:
     """Load existing DFT/ML phonon band structure and DOS docs from disk for a
     specified database.
@@ -54,6 +167,8 @@ def load_pymatgen_phonon_docs(
             directory. Defaults to "". If set, only files matching this pattern will be
             loaded. Ignored if docs_to_load is a list of file paths.
         verbose (bool): Whether to print progress bar. Defaults to True.
+        max_workers (int | None): Number of threads for loading docs. Defaults to
+            None, meaning ThreadPoolExecutor's default.
 
     Returns:
         dict[str, dict[str, dict]]: Outer key is material ID, 2nd-level key is the model
@@ -64,12 +179,9 @@ def load_pymatgen_phonon_docs(
     if len(docs_to_load) == 0:
         return {}
     if isinstance(docs_to_load, str):
-        if glob_patt == "":
-            paths = glob(f"{DATA_DIR}/{docs_to_load}/*.json.gz") + glob(
-                f"{DATA_DIR}/{docs_to_load}/*.json.xz"
-            )
-        else:
-            paths = glob(f"{DATA_DIR}/{docs_to_load}/{glob_patt}")
+        paths = glob_ph_docs(
+            f"{DATA_DIR}/{docs_to_load}", glob_patt=glob_patt or "*.json.*"
+        )
     elif {*map(type, docs_to_load)} == {str}:
         paths = docs_to_load
     else:
@@ -85,36 +197,45 @@ def load_pymatgen_phonon_docs(
 
     ph_docs = defaultdict(dict)
 
-    pbar = tqdm(paths, desc=f"Loading {len(paths)} docs")
-    for path in pbar if verbose else paths:
-        if verbose:
-            pbar.set_postfix_str(path.split("/")[-1])
-        try:
-            with zopen(path, mode="rt") as file:
-                ph_doc: PhononBSDOSDoc | PhononDBDocParsed = json.load(
-                    file, cls=MontyDecoder
-                )
-        except Exception as exc:
-            print(f"error loading {path=}: {exc}")
-            continue
+    # decompression releases the GIL so reading docs in threads overlaps file I/O
+    # and decompression with JSON parsing
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pbar = tqdm(
+            zip(paths, executor.map(_load_ph_doc, paths), strict=True),
+            total=len(paths),
+            desc=f"Loading {len(paths)} docs",
+            disable=not verbose,
+        )
+        for path, ph_doc in pbar:
+            if ph_doc is None:
+                continue
 
-        path_regex = r".*/(mp-\d+)-([A-Z][^-]+)-(.*).json.*"
-        try:
-            mp_id, _formula, model = re.search(path_regex, path).groups()
-        except (ValueError, AttributeError):
-            raise ValueError(
-                f"Can't parse MP ID and model from {path=}, should match {path_regex=}"
-            ) from None
-        if not mp_id.startswith("mp-"):
-            raise ValueError(f"Invalid {mp_id=}")
-
-        ph_doc.file_path = path
-        setattr(ph_doc, Key.mat_id, mp_id)
-        ph_docs[mp_id][model] = ph_doc
+            try:
+                mp_id, _formula, model = PH_DOC_PATH_REGEX.search(path).groups()
+            except (ValueError, AttributeError):
+                raise ValueError(
+                    f"Can't parse MP ID and model from {path=}, should match "
+                    f"{PH_DOC_PATH_REGEX.pattern=}"
+                ) from None
+            if not mp_id.startswith("mp-"):
+                raise ValueError(f"Invalid {mp_id=}")
+
+            ph_doc.file_path = path
+            setattr(ph_doc, Key.mat_id, mp_id)
+            ph_docs[mp_id][model] = ph_doc
 
     return ph_docs
 
 
+def _load_ph_doc(path: str) -> PhononBSDOSDoc | PhononDBDocParsed | None:
+    """Load and decode a single phonon doc. Returns None on errors."""
+    try:
+        return MontyDecoder().process_decoded(load_json(path))
+    except Exception as exc:
+        print(f"error loading {path=}: {exc}")
+        return None
+
+
 def get_df_summary(
     ph_docs: PhDocs | DB = DB.phonon_db,
     *,  # force keyword-only arguments
@@ -173,16 +294,12 @@ def get_df_summary(
         and refresh_cache == "incremental"
         and isinstance(df_cached, pd.DataFrame)
     ):
-        all_files = glob(f"{DATA_DIR}/{ph_docs}/*.json.gz") + glob(
-            f"{DATA_DIR}/{ph_docs}/*.json.xz"
-        )
+        all_files = glob_ph_docs(f"{DATA_DIR}/{ph_docs}")
 
-        loaded_mat_id_model_combos = tuple(df_cached.index)
+        loaded_mat_id_model_combos = set(df_cached.index)
 
         def id_model_combo_already_loaded(path: str) -> bool:
-            mat_id, _formula, model = re.search(
-                r".*/(mp-\d+)-([A-Z][^-]+)-(.*).json.*", path
-            ).groups()
+            mat_id, _formula, model = PH_DOC_PATH_REGEX.search(path).groups()
             return (mat_id, model) in loaded_mat_id_model_combos
 
         files_to_load = [
@@ -323,12 +440,12 @@ def update_key_name(directory: str, key_map: dict[str, str]) -> None:
     Example:
         update_key_name(f"{DATA_DIR}/{which_db}/", {"supercell_matrix": "supercell"})
     """
-    paths = glob(f"{directory}/*.json.gz") + glob(f"{directory}/*.json.xz")
+    # only update the copy the loaders read if a doc exists as both .xz and .zst
+    paths = glob_ph_docs(directory)
 
     for path in tqdm(paths, desc="Updating key name"):
         try:
-            with zopen(path, mode="rt") as file:
-                ph_doc: PhononBSDOSDoc | PhononDBDocParsed = json.load(file)
+            ph_doc: PhononBSDOSDoc | PhononDBDocParsed = load_json(path)
         except Exception as exc:
             print(f"Error loading {path=}: {exc}")
             continue
@@ -337,5 +454,8 @@ def update_key_name(directory: str, key_map: dict[str, str]) -> None:
             if old_key in ph_doc:
                 ph_doc[new_key] = ph_doc.pop(old_key)
 
-        with zopen(path, mode="wt") as file:
-            json.dump(ph_doc, file)
+        if path.endswith(".zst"):
+            save_json_zst(ph_doc, path)
+        else:
+            with zopen(path, mode="wt") as file:
+                json.dump(ph_doc, file)
@@ -5,7 +5,7 @@
 import numpy as np
 import pandas as pd
 from pymatviz.enums import Key
-from sklearn.metrics import accuracy_score, confusion_matrix, r2_score, roc_auc_score
+from sklearn.metrics import r2_score
 
 from ffonons.enums import Model, PhKey
 
@@ -25,73 +25,98 @@ def get_df_metrics(df_preds: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: Regression and classification metrics for predicting various
             phonon properties.
     """
-    df_metrics = pd.DataFrame()
-    df_metrics.index.name = "Model"
-
-    for model in Model:
-        if model == Key.pbe or model not in df_preds.index.levels[1]:
-            continue
-
+    models = [
+        model
+        for model in Model
+        if model != Key.pbe and model in df_preds.index.levels[1]
+    ]
+    if not models:
+        df_metrics = pd.DataFrame()
+        df_metrics.index.name = "Model"
+        return df_metrics
+
+    clf_metrics = _get_imag_modes_clf_metrics(df_preds, models)
+    # xs() scans the whole MultiIndex and copies, so only extract DFT rows once
+    df_dft = df_preds.xs(Key.pbe, level=1)
+
+    # collect metrics in a dict of dicts and build the dataframe once at the end
+    # rather than growing it cell by cell with .loc which reallocates every time
+    metrics: dict[str, dict[str, float]] = {}
+    for model_idx, model in enumerate(models):
         df_model = df_preds.xs(model, level=1)
-        df_dft = df_preds.xs(Key.pbe, level=1)
+        model_metrics = metrics.setdefault(model.label, {})
 
         # Regression metrics
         for metric in (Key.ph_dos_mae, PhKey.ph_dos_r2):
-            df_metrics.loc[model.label, metric.label] = df_model[metric].mean()
+            model_metrics[metric.label] = df_model[metric].mean()
 
         for metric in (Key.max_ph_freq,):
             diff = df_dft[metric] - df_model[metric]
-            ph_freq_mae = diff.abs().mean()
             not_nan = diff.dropna().index
-            ph_freq_r2 = r2_score(
+            model_metrics[getattr(PhKey, f"mae_{metric}").label] = diff.abs().mean()
+            model_metrics[getattr(PhKey, f"r2_{metric}").label] = r2_score(
                 df_dft[metric].loc[not_nan], df_model[metric].loc[not_nan]
             )
-            df_metrics.loc[model.label, getattr(PhKey, f"mae_{metric}").label] = (
-                ph_freq_mae
-            )
-            df_metrics.loc[model.label, getattr(PhKey, f"r2_{metric}").label] = (
-                ph_freq_r2
-            )
 
         # Classification metrics (only for Key.has_imag_ph_modes)
-        has_imag_modes_pred = df_model[Key.has_imag_ph_modes]
-        has_imag_modes_true = df_dft[Key.has_imag_ph_modes].loc[
-            has_imag_modes_pred.index
-        ]
-
-        # warning: this returns a 1x1 matrix conf_mat=[[1]] if only one class is present
-        # which will crash the unpacking of TN, FP, FN, TP
-        (_true_neg, false_pos), (false_neg, true_pos) = confusion_matrix(
-            y_true=has_imag_modes_true, y_pred=has_imag_modes_pred, normalize="true"
-        )
-
-        acc = accuracy_score(has_imag_modes_true, has_imag_modes_pred)
-        precision = (
-            true_pos / (true_pos + false_pos) if (true_pos + false_pos) > 0 else np.nan
-        )
-        recall = (
-            true_pos / (true_pos + false_neg) if (true_pos + false_neg) > 0 else np.nan
-        )
-        f1 = (
-            2 * (precision * recall) / (precision + recall)
-            if (precision + recall) > 0
-            else np.nan
-        )
-        roc_auc = roc_auc_score(has_imag_modes_true, has_imag_modes_pred)
-
-        metrics = {
-            PhKey.prec_imag_freq: precision,
-            PhKey.recall_imag_freq: recall,
-            PhKey.f1_imag_freq: f1,
-            PhKey.roc_auc_imag_freq: roc_auc,
-            PhKey.acc_imag_freq: acc,
-            PhKey.fpr_imag_freq: false_pos,
-            PhKey.fnr_imag_freq: false_neg,
-        }
-
-        for metric, val in metrics.items():
-            df_metrics.loc[model.label, metric.label] = val
+        for metric, vals in clf_metrics.items():
+            model_metrics[metric.label] = vals[model_idx]
+
+    df_metrics = pd.DataFrame.from_dict(metrics, orient="index")
+    df_metrics.index.name = "Model"
 
     if Key.ph_dos_mae.label in df_metrics.columns:
         df_metrics = df_metrics.sort_values(by=Key.ph_dos_mae.label)
     return df_metrics.round(3)
+
+
+def _get_imag_modes_clf_metrics(
+    df_preds: pd.DataFrame, models: list[Model]
+) -> dict[PhKey, np.ndarray]:
+    """Classification metrics for predicting the presence of imaginary phonon modes,
+    computed for all models at once from a (n_materials, n_models) prediction array.
+
+    Args:
+        df_preds (pd.DataFrame): Same as for get_df_metrics.
+        models (list[Model]): Models to compute metrics for.
+
+    Returns:
+        dict[PhKey, np.ndarray]: Map from metric key to array of values with the same
+            order as models.
+    """
+    df_imag = df_preds[Key.has_imag_ph_modes].unstack(level=1)
+    y_true = df_imag[Key.pbe].to_numpy(dtype=float, na_value=np.nan)[:, None]
+    y_pred = df_imag[models].to_numpy(dtype=float, na_value=np.nan)
+
+    # only count materials with both a DFT and a model prediction
+    valid = ~np.isnan(y_true) & ~np.isnan(y_pred)
+    is_pos, pred_pos = y_true == 1, y_pred == 1
+    true_pos = (valid & is_pos & pred_pos).sum(axis=0)
+    false_pos = (valid & ~is_pos & pred_pos).sum(axis=0)
+    false_neg = (valid & is_pos & ~pred_pos).sum(axis=0)
+    true_neg = (valid & ~is_pos & ~pred_pos).sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # rates normalized by number of true negatives/positives, same as
+        # sklearn.metrics.confusion_matrix(normalize="true")
+        tpr = true_pos / (true_pos + false_neg)
+        fnr = false_neg / (true_pos + false_neg)
+        fpr = false_pos / (true_neg + false_pos)
+        tnr = true_neg / (true_neg + false_pos)
+
+        precision = tpr / (tpr + fpr)
+        recall = tpr / (tpr + fnr)
+        f1 = 2 * (precision * recall) / (precision + recall)
+        acc = (true_pos + true_neg) / valid.sum(axis=0)
+        # ROC AUC of binary predictions reduces to the mean of TPR and TNR
+        roc_auc = (tpr + tnr) / 2
+
+    return {
+        PhKey.prec_imag_freq: precision,
+        PhKey.recall_imag_freq: recall,
+        PhKey.f1_imag_freq: f1,
+        PhKey.roc_auc_imag_freq: roc_auc,
+        PhKey.acc_imag_freq: acc,
+        PhKey.fpr_imag_freq: fpr,
+        PhKey.fnr_imag_freq: fnr,
+    }
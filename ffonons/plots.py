@@ -11,9 +11,10 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from matplotlib import pyplot as plt
+from matplotlib.collections import LineCollection
 from plotly.subplots import make_subplots
 from pymatgen.core import Structure
-from pymatgen.phonon import PhononDos, PhononDosPlotter
+from pymatgen.phonon import PhononBandStructureSymmLine, PhononDos, PhononDosPlotter
 from pymatgen.util.string import htmlify, latexify
 
 from ffonons.enums import DB, Model, PhKey
@@ -104,6 +105,95 @@ def plot_phonon_dos_mpl(
     return ax
 
 
+def plot_phonon_bands_mpl(
+    band_structs: PhononBandStructureSymmLine | dict[str, PhononBandStructureSymmLine],
+    ax: plt.Axes | None = None,
+    line_kwargs: dict[str, Any] | None = None,
+    per_line_kwargs: dict[str, dict[str, Any]] | None = None,
+) -> plt.Axes:
+    """Plot one or more phonon band structures with matplotlib.
+
+    Much faster than pymatgen's PhononBSPlotter for many bands since all bands of a
+    band structure are drawn as a single LineCollection rather than one line per band
+    and branch. All band structures must share the same q-point path.
+
+    Args:
+        band_structs (PhononBandStructureSymmLine | dict[str, ...]): Single band
+            structure or dict of band structures with legend labels as keys.
+        ax (plt.Axes | None = None): Matplotlib axes to plot on. If None, uses the
+            current axes.
+        line_kwargs (dict[str, Any] | None = None): Keyword arguments passed to each
+            LineCollection, e.g. linewidths or linestyles. Defaults to None.
+        per_line_kwargs (dict[str, dict[str, Any]] | None = None): Map from legend
+            label to keyword arguments for that band structure's LineCollection, e.g.
+            {"MACE": dict(linestyles="dashed")}. Takes precedence over line_kwargs.
+            Defaults to None.
+
+    Raises:
+        ValueError: If band structures have different q-point paths, e.g. due to
+            a symmetry change during ML relaxation.
+
+    Returns:
+        plt.Axes: Matplotlib axes
+    """
+    ax = ax or plt.gca()
+    if not isinstance(band_structs, dict):
+        band_structs = {"": band_structs}
+
+    # check paths match before drawing anything since all bands share the x-axis of
+    # the first band structure
+    ref_label, ref_bs = next(iter(band_structs.items()))
+    ref_branches = [branch["name"] for branch in ref_bs.branches]
+    for label, band_struct in band_structs.items():
+        branches = [branch["name"] for branch in band_struct.branches]
+        n_qpoints = len(band_struct.distance)
+        if n_qpoints != len(ref_bs.distance) or branches != ref_branches:
+            raise ValueError(
+                f"Band structures {ref_label!r} and {label!r} are incompatible: "
+                f"{len(ref_bs.distance)} vs {n_qpoints} q-points, "
+                f"branches {ref_branches} vs {branches}"
+            )
+
+    for idx, (label, band_struct) in enumerate(band_structs.items()):
+        distances = np.asarray(band_struct.distance)
+        bands = np.asarray(band_struct.bands)  # shape (n_bands, n_qpoints)
+
+        # one (n_qpoints_in_branch, 2) xy segment per band and branch, split at
+        # branches so discontinuous path segments like X|U aren't connected
+        segments: list[np.ndarray] = []
+        for branch in band_struct.branches:
+            start, end = branch["start_index"], branch["end_index"] + 1
+            branch_bands = bands[:, start:end]
+            xs = np.broadcast_to(distances[start:end], branch_bands.shape)
+            segments += [*np.stack([xs, branch_bands], axis=-1)]
+
+        defaults = dict(colors=f"C{idx}", linewidths=1.5, label=label or None)
+        kwargs = defaults | (line_kwargs or {}) | (per_line_kwargs or {}).get(label, {})
+        ax.add_collection(LineCollection(segments, **kwargs))
+
+    ax.autoscale_view()
+    ax.set_xlim(ref_bs.distance[0], ref_bs.distance[-1])
+    ax.axhline(0, color="black", linewidth=0.5)
+
+    # high-symmetry q-point ticks, merging labels at path discontinuities (e.g. X|U)
+    tick_labels: dict[float, list[str]] = defaultdict(list)
+    for dist, qpoint in zip(ref_bs.distance, ref_bs.qpoints, strict=True):
+        q_label = (qpoint.label or "").replace("GAMMA", "Γ")
+        if q_label and q_label not in tick_labels[dist]:
+            tick_labels[dist] += [q_label]
+    y_min, y_max = ax.get_ylim()
+    ax.vlines([*tick_labels], y_min, y_max, colors="black", linewidth=0.5)
+    ax.set_ylim(y_min, y_max)
+    ax.set_xticks([*tick_labels], ["|".join(labels) for labels in tick_labels.values()])
+
+    ax.set_xlabel("Wave Vector")
+    ax.set_ylabel("Frequency (THz)")
+    if any(band_structs):
+        ax.legend()
+
+    return ax
+
+
 def plotly_title(formula: str, href: str = "") -> str:
     """Make plotly figure title from HTML-ified formula and link to MP details page
     (legacy since only legacy has phonons) or other URL.
@@ -337,9 +337,9 @@ df_params.to_csv(csv_out_path)
 
 
 # %%
-with lzma.open(f"{DATA_DIR}/{DB.phonon_db}/structures.json.xz", mode="wb") as lzma_file:
-    json_str = json.dumps(structures, cls=MontyEncoder)
-    lzma_file.write(json_str.encode("utf-8"))
+# stream JSON straight into the compressor instead of building the full string first
+with lzma.open(f"{DATA_DIR}/{DB.phonon_db}/structures.json.xz", mode="wt") as file:
+    json.dump(structures, file, cls=MontyEncoder)
 
 
 # %% load CSV file
@@ -18,9 +18,10 @@ __date__ = "2023-12-15"
 
 # %% compute last phonon DOS peak for each model and MP
 imaginary_freq_tol = 0.01
+# lexsorted MultiIndex lets the .xs() and .loc[] lookups below use binary search
 df_summary = ffonons.io.get_df_summary(
     which_db := DB.phonon_db, imaginary_freq_tol=imaginary_freq_tol
-)
+).sort_index()
 
 print(f"total docs {len(df_summary)=:,}")
 
@@ -36,21 +37,23 @@ idx_n_avail = df_summary[Key.max_ph_freq].unstack().dropna(thresh=thresh).index
 n_avail = len(idx_n_avail)
 print(f"{n_avail:,} materials with results from at least {thresh} models (incl. DFT)")
 
+# slice once here and reuse in all cells below
+df_avail = df_summary.loc[idx_n_avail]
+df_pbe_avail = df_summary.xs(Key.pbe, level=1).loc[idx_n_avail]
+
 
 # %% save analyzed MP IDs to CSV for rendering with Typst
 for folder in (
     ffonons.PAPER_DIR,
     # f"{ffonons.DATA_DIR}/{which_db}",
 ):
-    df_summary.xs(Key.pbe, level=1).loc[idx_n_avail][
-        [Key.formula, Key.supercell, Key.n_sites]
-    ].sort_index(key=lambda idx: idx.str.split("-").str[1].astype(int)).to_csv(
-        f"{folder}/phonon-analysis-mp-ids.csv"
-    )
+    df_pbe_avail[[Key.formula, Key.supercell, Key.n_sites]].sort_index(
+        key=lambda idx: idx.str.split("-").str[1].astype(int)
+    ).to_csv(f"{folder}/phonon-analysis-mp-ids.csv")
 
 
 # %% Compute metrics dataframe
-df_metrics = get_df_metrics(df_summary.loc[idx_n_avail])
+df_metrics = get_df_metrics(df_avail)
 
 
 # %% Display and save metrics tables
@@ -8,14 +8,14 @@ import os
 
 import pandas as pd
 import pymatviz as pmv
-from pymatgen.phonon import PhononBSPlotter
+from matplotlib import pyplot as plt
 from pymatgen.util.string import latexify
 from pymatviz.enums import Key
 from tqdm import tqdm
 
 import ffonons
 from ffonons.enums import DB, Model
-from ffonons.plots import plot_phonon_dos_mpl
+from ffonons.plots import plot_phonon_bands_mpl, plot_phonon_dos_mpl
 
 __author__ = "Janosh Riebesell"
 __date__ = "2023-11-24"
@@ -74,16 +74,17 @@ for mp_id in tqdm(idx_n_avail[1]):
     bands_fig_path = f"{FIGS_DIR}/{mp_id}-bands-pbe-vs-{model1}.pdf"
 
     formula = ph_docs[mp_id][model1].structure.formula
-    pbe_bs_plotter = PhononBSPlotter(ml1_bands, label=Key.pbe.label)
-    ml_bs_plotter = PhononBSPlotter(ml1_bands, label=model1.label)
-
-    ax_bands = pbe_bs_plotter.plot_compare(
-        ml_bs_plotter,
-        linewidth=2,
-        on_incompatible="warn",
-        other_kwargs=dict(linestyle="dashed"),
-    )
-    if not ax_bands:
+    fig, ax_bands = plt.subplots(figsize=(12, 8))
+    try:
+        plot_phonon_bands_mpl(
+            {Key.pbe.label: ml1_bands, model1.label: ml1_bands},
+            ax=ax_bands,
+            line_kwargs=dict(linewidths=2),
+            per_line_kwargs={model1.label: dict(linestyles="dashed")},
+        )
+    except ValueError as exc:  # e.g. symmetry changed during ML relaxation
+        print(f"{mp_id=} {exc=}")
+        plt.close(fig)
         continue
     ax_bands.set_title(f"{latexify(formula)} {mp_id}", fontsize=24)
     ax_bands.figure.subplots_adjust(top=0.95)  # make room for title
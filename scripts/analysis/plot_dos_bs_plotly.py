@@ -4,11 +4,13 @@ Uses pymatviz DOS and band potting functions powered by Plotly.
 """
 
 # %%
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
 
 import pandas as pd
 import pymatviz as pmv
-from pymatgen.phonon import PhononBandStructureSymmLine, PhononDos
 from pymatviz.enums import Key
 from tqdm import tqdm
 
@@ -17,6 +19,9 @@ from ffonons import PDF_FIGS, SITE_FIGS, SOFT_PES_DIR
 from ffonons.enums import DB, Model
 from ffonons.plots import plotly_title, pretty_labels
 
+if TYPE_CHECKING:
+    from pymatgen.phonon import PhononBandStructureSymmLine, PhononDos
+
 __author__ = "Janosh Riebesell"
 __date__ = "2024-02-22"
 
@@ -65,15 +70,18 @@ ph_docs = ffonons.io.load_pymatgen_phonon_docs(
 
 # %%
 model = Model.m3gnet_ms
+existing_fig_names = {entry.name for entry in os.scandir(FIGS_DIR)}
 
 for mp_id in tqdm(idx_n_avail[2]):
+    fig_name = f"{mp_id}-bands-pbe-vs-{model}.pdf"
+    out_path = f"{FIGS_DIR}/{fig_name}"
+    if fig_name in existing_fig_names:
+        continue
+
     bs_pbe = getattr(ph_docs[mp_id][Key.pbe], Key.ph_band_structure)
     bs_ml = getattr(ph_docs[mp_id][model], Key.ph_band_structure)
 
     band_structs = {Key.pbe.label: bs_pbe, model.label: bs_ml}
-    out_path = f"{FIGS_DIR}/{mp_id}-bands-pbe-vs-{model}.pdf"
-    if os.path.isfile(out_path):
-        continue
     try:
         fig_bs = pmv.phonon_bands(band_structs, line_kwds=dict(width=1.5))
     except ValueError as exc:
@@ -90,10 +98,13 @@ for mp_id in tqdm(idx_n_avail[2]):
 
 
 # %% plotly bands+DOS and similarity heatmaps
-for mp_id in tqdm(idx_n_avail[4]):  # Use materials with all 4 models available
-    ph_doc = ffonons.io.load_pymatgen_phonon_docs(which_db, materials_ids=[mp_id])[
-        mp_id
-    ]
+def plot_bands_and_dos(mp_id: str) -> str | None:
+    """Plot and save bands+DOS figure comparing DFT and ML models for one material.
+    Loads its own docs so it can run in a worker process. Returns the PDF path.
+    """
+    ph_doc = ffonons.io.load_pymatgen_phonon_docs(
+        which_db, materials_ids=[mp_id], verbose=False
+    )[mp_id]
 
     keys = sorted(ph_doc, reverse=True)
     bands_dict: dict[str, PhononBandStructureSymmLine] = {
@@ -105,8 +116,6 @@ for mp_id in tqdm(idx_n_avail[4]):  # Use materials with all 4 models available
     }
     img_name = f"{mp_id}-bs-dos-{'-vs-'.join(keys)}"
     out_path = f"{FIGS_DIR}/{img_name}.pdf"
-    # if os.path.isfile(out_path):
-    #     continue
     color_map = {
         model.label: {"line_color": clr}
         for model, clr in (
@@ -129,7 +138,7 @@ for mp_id in tqdm(idx_n_avail[4]):  # Use materials with all 4 models available
         )
     except ValueError as exc:
         print(f"{mp_id=} {exc=}")
-        continue
+        return None
 
     # Remap legend labels
     for trace in fig_bs_dos.data:
@@ -140,7 +149,6 @@ for mp_id in tqdm(idx_n_avail[4]):  # Use materials with all 4 models available
             Model.m3gnet_ms.label: "M3GNet",
         }.get(trace.name, trace.name)
 
-    formula = next(iter(ph_doc.values())).structure.formula
     # fig_bs_dos.layout.title = dict(text=plotly_title(formula, mp_id), x=0.5, y=0.97)
     # fig_bs_dos.layout.margin = dict(t=40, b=0, l=5, r=5)
     fig_bs_dos.layout.margin = dict(t=5, b=0, l=5, r=5)
@@ -152,8 +160,22 @@ for mp_id in tqdm(idx_n_avail[4]):  # Use materials with all 4 models available
     # fig_bs_dos.layout.xaxis.update(title_standoff=0)
     # fig_bs_dos.layout.xaxis2.update(title_standoff=0)
 
-    fig_bs_dos.show()
     height = 400
     pmv.save_fig(fig_bs_dos, out_path, prec=4, height=height, width=1.3 * height)
     fig_bs_dos.layout.update(template="pymatviz_dark", paper_bgcolor="rgba(0,0,0,0)")
     pmv.save_fig(fig_bs_dos, f"{SITE_FIGS}/{img_name}.svelte", prec=4)
+    return out_path
+
+
+# materials are independent, so render them in parallel where the platform forks
+# worker processes. spawn/forkserver (default on macOS and Python 3.14+) would
+# re-import this script (no __main__ guard, often run cell by cell) in every worker,
+# so render serially there instead
+mat_ids = idx_n_avail[4]  # Use materials with all 4 models available
+if multiprocessing.get_start_method() == "fork":
+    with ProcessPoolExecutor() as executor:
+        bs_dos_fig_paths = list(
+            tqdm(executor.map(plot_bands_and_dos, mat_ids), total=len(mat_ids))
+        )
+else:
+    bs_dos_fig_paths = [plot_bands_and_dos(mp_id) for mp_id in tqdm(mat_ids)]
@@ -3,31 +3,32 @@
 # %%
 import os
 import random
-import re
-from collections import defaultdict
-from glob import glob
 
+import pandas as pd
 import pymatviz as pmv
+from pymatviz.enums import Key
 
 from ffonons import DATA_DIR, PAPER_DIR
 from ffonons.enums import Model
-from ffonons.io import load_pymatgen_phonon_docs
+from ffonons.io import PH_DOC_PATH_REGEX, glob_ph_docs, load_pymatgen_phonon_docs
 from ffonons.plots import plot_thermo_props
 
-# Get list of unique material IDs and their available models
-mat_id_models = defaultdict(set)
-for path in glob(f"{DATA_DIR}/phonon-db/*.json.xz"):
-    mat_id = re.search(r"(mp-\d+)", path).group(1)
-    model = re.search(rf"{mat_id}-.*?-(.*?)\.json\.xz", path).group(1)
-    mat_id_models[mat_id].add(model)
+# Table of doc paths with material IDs as rows and models as columns (NaN if missing)
+doc_rows = []
+for path in glob_ph_docs(f"{DATA_DIR}/phonon-db"):
+    if match := PH_DOC_PATH_REGEX.search(path):
+        mat_id, _formula, model = match.groups()
+        doc_rows += [(mat_id, model, path)]
+df_paths = pd.DataFrame(doc_rows, columns=[Key.mat_id, Key.model, "path"]).pivot(
+    index=Key.mat_id, columns=Key.model, values="path"
+)
 
 # Filter for materials with at least 3 models including PBE
 min_models_needed = 3
-eligible_mat_ids = [
-    mat_id
-    for mat_id, models in mat_id_models.items()
-    if len(models) >= min_models_needed and "pbe" in models
-]
+has_enough_models = df_paths.notna().sum(axis=1) >= min_models_needed
+# no PBE column if no PBE docs were found, let the ValueError below handle that
+has_pbe = df_paths[Key.pbe].notna() if Key.pbe in df_paths else False
+eligible_mat_ids = df_paths.index[has_enough_models & has_pbe].tolist()
 
 if not eligible_mat_ids:
     raise ValueError("No materials found with 3+ models including PBE")
@@ -38,11 +39,9 @@ print(f"Found {len(eligible_mat_ids)} materials with 3+ models including PBE")
 random.seed(42)  # For reproducibility
 selected_mat_ids = random.sample(eligible_mat_ids, min(8, len(eligible_mat_ids)))
 
-# For each material ID, find all model files
-selected_paths = []
-for mat_id in selected_mat_ids:
-    model_paths = glob(f"{DATA_DIR}/phonon-db/{mat_id}-*.json.xz")
-    selected_paths.extend(model_paths)
+# Doc paths for all models of selected materials
+df_selected = df_paths.loc[selected_mat_ids].melt(value_name="path")
+selected_paths = df_selected["path"].dropna().tolist()
 
 print(f"Loading {len(selected_paths)} docs for {len(selected_mat_ids)} materials")
 
@@ -19,6 +19,7 @@ from ffonons.dbs.phonondb import (
     scrape_and_fetch_togo_docs_from_page,
 )
 from ffonons.enums import DB
+from ffonons.io import glob_ph_docs
 
 __author__ = "Janine George, Aakash Nair, Janosh Riebesell"
 __date__ = "2023-12-07"
@@ -86,7 +87,8 @@ print(f"{n_new_zip_files - n_prev_zip_files} new zip files fetched")
 
 # %% convert phonondb docs to lzma compressed JSON which is much faster to load
 zip_files = glob(f"{ph_docs_dir}/mp-*-pbe.zip")
-lzma_files = glob(f"{ph_docs_dir}/mp-*-pbe.json.xz")
+# converted docs may since have been recompressed as .json.zst
+lzma_files = glob_ph_docs(ph_docs_dir, glob_patt="mp-*-pbe.json.*")
 
 ids_todo = {
     re.match(r"(mp-\d+)-", zip_path.split("/")[-1])[1] for zip_path in zip_files
@@ -103,7 +105,7 @@ for mat_id in (pbar := tqdm(ids_todo, desc="Parsing PhononDB docs to PMG lzma"))
     # mat_id = "-".join(zip_path.split("/")[-1].split("-")[:2])
     if not re.match(r"mp-\d+", mat_id):
         raise ValueError(f"Invalid {mat_id=}")
-    existing_lzma_docs = glob(f"{ph_docs_dir}/{mat_id}-*-pbe.json.xz")
+    existing_lzma_docs = glob_ph_docs(ph_docs_dir, glob_patt=f"{mat_id}-*-pbe.json.*")
     if len(existing_lzma_docs) > 1:
         raise RuntimeError(f"> 1 doc for {mat_id=}: {existing_lzma_docs}")
     zip_docs = glob(f"{ph_docs_dir}/{mat_id}-*-pbe.zip")
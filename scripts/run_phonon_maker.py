@@ -1,12 +1,11 @@
 """Locally run atomate2 PhononMaker on PhononDB, MP or GNoME supercells."""
 
 # %%
-import json
 import os
 import re
 import shutil
-from glob import glob
-from time import perf_counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter, time
 from zipfile import BadZipFile
 
 import atomate2.forcefields.jobs as ff_jobs
@@ -19,14 +18,15 @@ from atomate2.forcefields.flows.phonons import PhononMaker
 from atomate2.forcefields.utils import MLFF
 from IPython.display import display
 from jobflow import run_locally
-from monty.io import zopen
-from monty.json import MontyDecoder, MontyEncoder
+from monty.json import MontyDecoder
 from pymatviz.enums import Key
 from tqdm import tqdm
 
 from ffonons import DATA_DIR, PDF_FIGS, ROOT
+from ffonons.dbs.mp import get_mp_ph_docs_bulk
 from ffonons.dbs.phonondb import PhononDBDocParsed
-from ffonons.enums import DB
+from ffonons.enums import DB, Model
+from ffonons.io import glob_ph_docs, load_json, save_json_zst
 from ffonons.plots import plotly_title
 
 __author__ = "Janosh Riebesell"
@@ -36,25 +36,66 @@ __date__ = "2023-11-19"
 go.Figure.show = lambda *_args, **_kwargs: None
 
 
+def clean_stale_runs(runs_dir: str, max_age_days: float = 7) -> list[str]:
+    """Delete PhononMaker job directories under runs_dir/{model} not modified in
+    the last max_age_days. Keeps recent runs so reruns don't pay the cost of
+    deleting and recreating GBs of outputs.
+
+    Args:
+        runs_dir (str): Directory containing one subdirectory of job dirs per model.
+        max_age_days (float): Minimum age in days of job dirs to delete.
+            Defaults to 7.
+
+    Returns:
+        list[str]: Paths of deleted job directories.
+    """
+    if not os.path.isdir(runs_dir):
+        return []
+    cutoff = time() - max_age_days * 86_400
+    removed: list[str] = []
+    for model_dir in os.scandir(runs_dir):
+        if not model_dir.is_dir():
+            continue
+        for entry in os.scandir(model_dir.path):
+            if entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += [entry.path]
+    return removed
+
+
 # %%
 which_db = DB.phonon_db
 RUNS_DIR = f"{ROOT}/tmp/runs"  # noqa: S108
 PH_DOCS_DIR = f"{DATA_DIR}/{which_db}"
 FIGS_DIR = f"{PDF_FIGS}/{which_db}"
-shutil.rmtree(RUNS_DIR, ignore_errors=True)  # remove old runs to save space
+clean_runs = False  # whether to delete job dirs older than a week to save space
+if clean_runs:
+    n_removed = len(clean_stale_runs(RUNS_DIR, max_age_days=7))
+    print(f"Removed {n_removed:,} stale job dirs from {RUNS_DIR}")
 for directory in (PH_DOCS_DIR, FIGS_DIR, RUNS_DIR):
     os.makedirs(directory, exist_ok=True)
 
+# run force evaluations for all phonon displacements on GPU if available
+if torch.cuda.is_available():
+    device = "cuda"
+elif torch.backends.mps.is_available():
+    device = "mps"
+else:
+    device = "cpu"
+# MPS doesn't support float64, elsewhere keep float64 for accurate finite differences
+mace_dtype = "float32" if device == "mps" else "float64"
+
 common_relax_kwds = dict(fmax=0.00001)
-mace_kwds = dict(model="medium")
-chgnet_kwds = dict(optimizer_kwargs=dict(use_device="mps"))
-s7net_kwds = dict(model="SevenNet-0")
-
-all_model_kwargs = {
-    MLFF.MACE: dict(model="medium", default_dtype="float64"),
-    MLFF.M3GNet: dict(model="medium"),
-    MLFF.CHGNet: dict(optimizer_kwargs=dict(use_device="mps")),
-    MLFF.SevenNet: dict(model="SevenNet-0"),
+
+# map atomate2 force field name to (ffonons model, calculator kwargs)
+all_model_kwargs: dict[MLFF, tuple[Model, dict[str, str]]] = {
+    MLFF.MACE: (
+        Model.mace_mp0,
+        dict(model="medium", default_dtype=mace_dtype, device=device),
+    ),
+    MLFF.M3GNet: (Model.m3gnet_ms, dict(model="medium")),
+    MLFF.CHGNet: (Model.chgnet_030, dict(use_device=device)),
+    MLFF.SevenNet: (Model.sevennet_0, dict(model="SevenNet-0", device=device)),
 }
 
 
@@ -67,15 +108,21 @@ bad_ids = [mp_id for mp_id in mp_ids if not mp_id.startswith("mp-")]
 if len(bad_ids) != 0:
     raise RuntimeError(f"{bad_ids=}")
 
+if which_db == DB.mp:  # fetch all missing MP phonon docs in a single bulk query
+    mp_doc_paths = get_mp_ph_docs_bulk(mp_ids, docs_dir=PH_DOCS_DIR)
+    print(f"{len(mp_doc_paths):,} / {len(mp_ids):,} MP phonon docs on disk")
+
 
 # %% check existing and missing DFT/ML phonon docs
-dft_docs = glob(f"{DATA_DIR}/{which_db}/mp-*-pbe.json.xz")
-pbe_ids = [re.search(r"mp-\d+", path).group() for path in dft_docs]
+# glob_ph_docs lists docs kept as both .json.xz and .json.zst only once
+dft_docs = glob_ph_docs(PH_DOCS_DIR, glob_patt="mp-*-pbe.json.*")
+mp_id_regex = re.compile(r"mp-\d+")
+pbe_ids = [mp_id_regex.search(path).group() for path in dft_docs]
 
 total_missing_ids, df_missing = set(), pd.DataFrame()
 for model_name, _kwargs in all_model_kwargs.values():
-    model_docs = glob(f"{DATA_DIR}/{which_db}/*-{model_name}.json.xz")
-    model_ids = [re.search(r"mp-\d+", path).group() for path in model_docs]
+    model_docs = glob_ph_docs(PH_DOCS_DIR, glob_patt=f"*-{model_name}.json.*")
+    model_ids = [mp_id_regex.search(path).group() for path in model_docs]
     missing_ids = {*pbe_ids} - {*model_ids}
     total_missing_ids |= missing_ids
     df_missing[model_name.label] = {"missing": len(missing_ids), "have": len(model_ids)}
@@ -94,15 +141,23 @@ display(df_missing.T.style.set_caption(caption))
 # %% Main loop over materials and models
 errors: list[tuple[str, str, str]] = []
 skip_existing = True
+# list docs dir once up front instead of hitting the file system for every
+# material-model pair
+existing_doc_names = {entry.name for entry in os.scandir(PH_DOCS_DIR)}
+# write PDFs in the background so kaleido export overlaps with the next phonon
+# calculation, single worker since kaleido isn't safe to call concurrently
+fig_pool = ThreadPoolExecutor(max_workers=1)
+fig_futures: dict[str, Future] = {}
 
 for dft_doc_path in (pbar := tqdm(missing_paths)):  # PhononDB
     mat_id = "-".join(dft_doc_path.split("/")[-1].split("-")[:2])
     pbar.set_description(f"{mat_id=}")
-    if not re.match(r"mp-\d+", mat_id):
+    if not mp_id_regex.match(mat_id):
         raise ValueError(f"Invalid {mat_id=}")
 
-    with zopen(dft_doc_path, mode="rt") as file:
-        phonondb_doc: PhononDBDocParsed = json.load(file, cls=MontyDecoder)
+    phonondb_doc: PhononDBDocParsed = MontyDecoder().process_decoded(
+        load_json(dft_doc_path)
+    )
 
     struct = phonondb_doc.structure
     supercell = phonondb_doc.supercell
@@ -114,9 +169,12 @@ for dft_doc_path in (pbar := tqdm(missing_paths)):  # PhononDB
     for pkg_name, (model_name, model_kwargs) in all_model_kwargs.items():
         os.makedirs(root_dir := f"{RUNS_DIR}/{model_name.value}", exist_ok=True)
 
-        ml_doc_path = f"{PH_DOCS_DIR}/{mat_id}-{formula}-{model_name.value}.json.xz"
+        ml_doc_name = f"{mat_id}-{formula}-{model_name.value}.json"
+        ml_doc_path = f"{PH_DOCS_DIR}/{ml_doc_name}.zst"
 
-        if os.path.isfile(ml_doc_path) and skip_existing:
+        # also check for ML docs saved in legacy .json.xz format
+        ml_doc_names = {f"{ml_doc_name}.zst", f"{ml_doc_name}.xz"}
+        if skip_existing and ml_doc_names & existing_doc_names:
             # skip if ML doc exists, can easily generate bs_dos_fig from that without
             # rerunning workflow
             print(f"\nSkipping {model_name!s} for {mat_id}: phonon doc file exists")
@@ -125,7 +183,7 @@ for dft_doc_path in (pbar := tqdm(missing_paths)):  # PhononDB
             start = perf_counter()
             phonon_flow = PhononMaker(
                 bulk_relax_maker=ff_jobs.ForceFieldRelaxMaker(
-                    force_field_name=model_name,
+                    force_field_name=pkg_name,
                     relax_kwargs=common_relax_kwds,
                     calculator_kwargs=model_kwargs,
                     relax_cell=relax_cell,
@@ -155,8 +213,7 @@ for dft_doc_path in (pbar := tqdm(missing_paths)):  # PhononDB
             last_job_id = phonon_flow[-1].uuid
             ml_phonon_doc: Atomate2PhononBSDOSDoc = result[last_job_id][1].output
 
-            with zopen(ml_doc_path, mode="wt") as file:
-                json.dump(ml_phonon_doc, file, cls=MontyEncoder)
+            save_json_zst(ml_phonon_doc, ml_doc_path)
 
             ml_bs, ml_dos = ml_phonon_doc.phonon_bandstructure, ml_phonon_doc.phonon_dos
             bands_dict = {model_name.label: ml_bs}
@@ -174,7 +231,8 @@ for dft_doc_path in (pbar := tqdm(missing_paths)):  # PhononDB
             fig_bs_dos.show()
 
             img_name = f"{mat_id}-bs-dos-{Key.pbe}-vs-{model_name.value}"
-            pmv.save_fig(fig_bs_dos, f"{FIGS_DIR}/{img_name}.pdf")
+            img_path = f"{FIGS_DIR}/{img_name}.pdf"
+            fig_futures[img_path] = fig_pool.submit(pmv.save_fig, fig_bs_dos, img_path)
         except (ValueError, RuntimeError, BadZipFile, Exception) as exc:
             # known possible errors:
             # - the 2 band structures are not compatible, due to symmetry change during
@@ -196,5 +254,10 @@ for dft_doc_path in (pbar := tqdm(missing_paths)):  # PhononDB
         # and M3GNet, so we reset it here
         torch.set_default_dtype(torch.float32)
 
+fig_pool.shutdown(wait=True)
+for img_path, future in fig_futures.items():
+    if exc := future.exception():
+        print(f"Failed to save {img_path}: {exc!r}")
+
 if errors:
     print(f"\n{errors=}")
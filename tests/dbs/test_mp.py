@@ -11,7 +11,7 @@ from monty.io import zopen
 from pymatgen.core import Structure
 
 from ffonons import TEST_FILES
-from ffonons.dbs.mp import get_mp_ph_docs
+from ffonons.dbs.mp import get_mp_ph_docs, get_mp_ph_docs_bulk
 
 
 @pytest.fixture
@@ -48,7 +48,7 @@ def test_get_mp_ph_docs_new_file(
     assert isinstance(ph_doc, PhononBSDOSDoc)
     assert ph_doc.material_id == mock_phonon_doc.material_id
     assert ph_doc.last_updated.replace(tzinfo=UTC) <= datetime.now(UTC)
-    assert file_path == f"{tmp_path}/mp-149-Si2.json.xz"
+    assert file_path == f"{tmp_path}/mp-149-Si2-pbe.json.xz"
     assert os.path.isfile(file_path)
 
     with zopen(file_path, mode="rt") as file:
@@ -66,7 +66,7 @@ def test_get_mp_ph_docs_existing_file(
 ) -> None:
     mock_mp_rester.get_structure_by_material_id.return_value = mock_structure
 
-    file_path = f"{TEST_FILES}/mp/mp-149-Si2.json.xz"
+    file_path = Path(f"{TEST_FILES}/mp/mp-149-Si2.json.xz")
     ph_doc, returned_path = get_mp_ph_docs("mp-149", docs_dir=f"{TEST_FILES}/mp")
 
     assert isinstance(ph_doc, dict)
@@ -75,8 +75,26 @@ def test_get_mp_ph_docs_existing_file(
     last_updated = ph_doc["last_updated"].rstrip("Z")
     saved_date = datetime.fromisoformat(last_updated).replace(tzinfo=UTC)
     assert saved_date <= datetime.now(UTC)
-    assert returned_path == file_path
+    assert Path(returned_path) == file_path
     mock_mp_rester.materials.phonon.get_data_by_id.assert_not_called()
+    mock_mp_rester.get_structure_by_material_id.assert_not_called()
+
+
+def test_get_mp_ph_docs_ignores_ml_docs(
+    mock_mp_rester: MagicMock,
+    mock_structure: MagicMock,
+    mock_phonon_doc: PhononBSDOSDoc,
+    tmp_path: Path,
+) -> None:
+    ml_doc_path = tmp_path / "mp-149-Si2-mace-y7uhwpje.json.xz"
+    ml_doc_path.touch()
+    mock_mp_rester.get_structure_by_material_id.return_value = mock_structure
+    mock_mp_rester.materials.phonon.get_data_by_id.return_value = mock_phonon_doc
+
+    _, file_path = get_mp_ph_docs("mp-149", docs_dir=str(tmp_path))
+
+    assert file_path == f"{tmp_path}/mp-149-Si2-pbe.json.xz"
+    mock_mp_rester.materials.phonon.get_data_by_id.assert_called_once_with("mp-149")
 
 
 def test_get_mp_ph_docs_no_save(
@@ -95,3 +113,111 @@ def test_get_mp_ph_docs_no_save(
     assert ph_doc.last_updated.replace(tzinfo=UTC) <= datetime.now(UTC)
     assert file_path == ""
     get_ph_data_by_id.assert_called_once_with("mp-149")
+
+
+def test_get_mp_ph_docs_retries_rate_limits(
+    mock_mp_rester: MagicMock,
+    mock_structure: MagicMock,
+    mock_phonon_doc: PhononBSDOSDoc,
+    tmp_path: Path,
+) -> None:
+    mock_mp_rester.get_structure_by_material_id.return_value = mock_structure
+    mock_mp_rester.materials.phonon.get_data_by_id.return_value = mock_phonon_doc
+
+    get_mp_ph_docs("mp-149", docs_dir=str(tmp_path))
+
+    mounted = dict(call.args for call in mock_mp_rester.session.mount.call_args_list)
+    assert set(mounted) == {"http://", "https://"}
+    retry = mounted["https://"].max_retries
+    assert 429 in retry.status_forcelist
+    assert retry.respect_retry_after_header
+
+
+def test_get_mp_ph_docs_bulk(
+    mock_mp_rester: MagicMock,
+    mock_structure: MagicMock,
+    mock_phonon_doc: PhononBSDOSDoc,
+    tmp_path: Path,
+) -> None:
+    existing_path = tmp_path / "mp-1-Foo.json.xz"
+    existing_path.touch()
+    mock_mp_rester.materials.summary.search.return_value = [
+        MagicMock(material_id="mp-149", structure=mock_structure)
+    ]
+    mock_mp_rester.materials.phonon.search.return_value = [mock_phonon_doc]
+
+    doc_paths = get_mp_ph_docs_bulk(["mp-1", "mp-149"], docs_dir=str(tmp_path))
+
+    assert doc_paths == {
+        "mp-1": str(existing_path),
+        "mp-149": f"{tmp_path}/mp-149-Si2-pbe.json.xz",
+    }
+    assert os.path.isfile(doc_paths["mp-149"])
+    # only IDs without a doc on disk are queried, each in a single request
+    mock_mp_rester.materials.phonon.search.assert_called_once_with(
+        material_ids=["mp-149"]
+    )
+    mock_mp_rester.materials.summary.search.assert_called_once()
+
+
+def test_get_mp_ph_docs_bulk_all_existing(
+    mock_mp_rester: MagicMock, tmp_path: Path
+) -> None:
+    (tmp_path / "mp-149-Si2-pbe.json.xz").touch()
+
+    doc_paths = get_mp_ph_docs_bulk(["mp-149"], docs_dir=str(tmp_path))
+
+    assert Path(doc_paths["mp-149"]) == tmp_path / "mp-149-Si2-pbe.json.xz"
+    mock_mp_rester.materials.phonon.search.assert_not_called()
+
+
+def test_get_mp_ph_docs_bulk_zstd_docs(
+    mock_mp_rester: MagicMock, tmp_path: Path
+) -> None:
+    # docs recompressed by convert_docs_to_zstd(remove_old=True) still count as cached
+    (tmp_path / "mp-1-Foo.json.zst").touch()
+    (tmp_path / "mp-149-Si2-pbe.json.zst").touch()
+
+    doc_paths = get_mp_ph_docs_bulk(["mp-1", "mp-149"], docs_dir=str(tmp_path))
+
+    assert {mp_id: Path(path) for mp_id, path in doc_paths.items()} == {
+        "mp-1": tmp_path / "mp-1-Foo.json.zst",
+        "mp-149": tmp_path / "mp-149-Si2-pbe.json.zst",
+    }
+    mock_mp_rester.materials.phonon.search.assert_not_called()
+
+
+def test_get_mp_ph_docs_bulk_ignores_ml_docs(
+    mock_mp_rester: MagicMock,
+    mock_structure: MagicMock,
+    mock_phonon_doc: PhononBSDOSDoc,
+    tmp_path: Path,
+) -> None:
+    # ML docs are saved in the same dir as MP docs when running on MP structures
+    (tmp_path / "mp-149-Si2-mace-y7uhwpje.json.xz").touch()
+    mock_mp_rester.materials.summary.search.return_value = [
+        MagicMock(material_id="mp-149", structure=mock_structure)
+    ]
+    mock_mp_rester.materials.phonon.search.return_value = [mock_phonon_doc]
+
+    doc_paths = get_mp_ph_docs_bulk(["mp-149"], docs_dir=str(tmp_path))
+
+    assert doc_paths == {"mp-149": f"{tmp_path}/mp-149-Si2-pbe.json.xz"}
+    mock_mp_rester.materials.phonon.search.assert_called_once_with(
+        material_ids=["mp-149"]
+    )
+
+
+def test_get_mp_ph_docs_bulk_chunks(mock_mp_rester: MagicMock, tmp_path: Path) -> None:
+    mp_ids = [f"mp-{idx}" for idx in range(5)]
+    mock_mp_rester.materials.summary.search.return_value = []
+    mock_mp_rester.materials.phonon.search.return_value = []
+
+    doc_paths = get_mp_ph_docs_bulk(mp_ids, docs_dir=str(tmp_path), chunk_size=2)
+
+    assert doc_paths == {}
+    queried_ids = [
+        call.kwargs["material_ids"]
+        for call in mock_mp_rester.materials.phonon.search.call_args_list
+    ]
+    assert sorted(queried_ids) == [["mp-0", "mp-1"], ["mp-2", "mp-3"], ["mp-4"]]
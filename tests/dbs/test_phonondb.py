@@ -124,6 +124,23 @@ def test_phonondb_doc_to_pmg_lzma(tmp_path: Path) -> None:
     ]
 
 
+def test_phonondb_doc_to_pmg_lzma_skips_zstd_doc(tmp_path: Path) -> None:
+    # docs recompressed by convert_docs_to_zstd(remove_old=True) count as existing
+    existing_doc = tmp_path / "mp-643101-K3Sb-pbe.json.zst"
+    existing_doc.touch()
+
+    with (
+        patch("ffonons.dbs.phonondb.ph_docs_dir", str(tmp_path)),
+        patch("ffonons.dbs.phonondb.parse_phonondb_docs") as mock_parse,
+    ):
+        out_path = phonondb_doc_to_pmg_lzma(
+            phonondb_zip_file_path, existing="skip-silent"
+        )
+
+    assert Path(out_path) == existing_doc
+    mock_parse.assert_not_called()
+
+
 def test_parse_phonondb_docs() -> None:
     ph_doc = parse_phonondb_docs(phonondb_zip_file_path)
     assert isinstance(ph_doc, PhononDBDocParsed)
@@ -1,3 +1,5 @@
+import json
+import os
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -5,6 +7,8 @@ import numpy as np
 import pandas as pd
 import pytest
 from atomate2.common.schemas.phonons import PhononBSDOSDoc
+from monty.io import zopen
+from monty.json import MontyDecoder
 from pymatgen.core import Lattice, Structure
 from pymatgen.phonon import PhononBandStructureSymmLine, PhononDos
 from pymatviz.enums import Key
@@ -27,16 +31,7 @@ def test_load_pymatgen_phonon_docs(mock_data_dir: Path) -> None:
     mock_ph_doc.phonon_bandstructure = MagicMock(spec=PhononBandStructureSymmLine)
     mock_ph_doc.phonon_dos = MagicMock(spec=PhononDos)
 
-    with (
-        patch("ffonons.io.zopen"),
-        patch("ffonons.io.json.load", return_value=mock_ph_doc),
-        patch("ffonons.io.re.search") as mock_search,
-    ):
-        # Mock the regex search to return the expected groups
-        mock_search.return_value.groups.side_effect = [
-            ("mp-1", "NaCl", "pbe"),
-            ("mp-2", "MgO", "ml_model"),
-        ]
+    with patch("ffonons.io.load_json", return_value=mock_ph_doc):
         result = ffonons.io.load_pymatgen_phonon_docs(docs_to_load="mp")
 
     assert len(result) == 2
@@ -47,22 +42,115 @@ def test_load_pymatgen_phonon_docs(mock_data_dir: Path) -> None:
     assert hasattr(result["mp-1"]["pbe"], "file_path")
 
 
-def test_update_key_name(mock_data_dir: Path) -> None:
+@pytest.mark.parametrize("ext", ["json", "json.gz", "json.xz"])
+def test_load_json(tmp_path: Path, ext: str) -> None:
+    path = f"{tmp_path}/doc.{ext}"
+    with zopen(path, mode="wt") as file:
+        json.dump({"freqs": [1.5, 2.5], "label": "pbe"}, file)
+
+    assert ffonons.io.load_json(path) == {"freqs": [1.5, 2.5], "label": "pbe"}
+
+
+def test_load_json_nan(tmp_path: Path) -> None:
+    # orjson rejects NaN literals written by json.dump, check fallback to json
+    path = f"{tmp_path}/doc.json.gz"
+    with zopen(path, mode="wt") as file:
+        json.dump({"entropy": float("nan")}, file)
+
+    assert np.isnan(ffonons.io.load_json(path)["entropy"])
+
+
+def test_save_json_zst(tmp_path: Path) -> None:
+    path = f"{tmp_path}/doc.json.zst"
+    struct = Structure(Lattice.cubic(5.0), ["Na", "Cl"], [[0, 0, 0], [0.5, 0.5, 0.5]])
+    ffonons.io.save_json_zst({"structure": struct}, path)
+
+    doc = MontyDecoder().process_decoded(ffonons.io.load_json(path))
+    assert doc["structure"] == struct
+
+
+def test_convert_docs_to_zstd(tmp_path: Path) -> None:
+    for idx, ext in enumerate(("gz", "xz")):
+        with zopen(f"{tmp_path}/mp-{idx}-X-pbe.json.{ext}", mode="wt") as file:
+            json.dump({"idx": idx}, file)
+
+    zst_paths = ffonons.io.convert_docs_to_zstd(str(tmp_path), remove_old=True)
+
+    # compare Paths since glob joins with os.sep (backslashes on Windows)
+    assert sorted(map(Path, zst_paths)) == [
+        tmp_path / f"mp-{idx}-X-pbe.json.zst" for idx in range(2)
+    ]
+    assert [ffonons.io.load_json(path)["idx"] for path in sorted(zst_paths)] == [0, 1]
+    assert sorted(os.listdir(tmp_path)) == [
+        f"mp-{idx}-X-pbe.json.zst" for idx in range(2)
+    ]
+
+
+def test_glob_ph_docs(tmp_path: Path) -> None:
+    # doc 0 was converted to zstd without removing the original, doc 1 is xz only
+    for name in (
+        "mp-0-X-pbe.json.xz",
+        "mp-0-X-pbe.json.zst",
+        "mp-1-X-mace.json.gz",
+        "mp-1-X-mace.json.xz",
+        "df-summary.csv.gz",
+    ):
+        (tmp_path / name).touch()
+
+    doc_paths = ffonons.io.glob_ph_docs(str(tmp_path))
+    assert [*map(Path, doc_paths)] == [
+        tmp_path / "mp-0-X-pbe.json.zst",
+        tmp_path / "mp-1-X-mace.json.xz",
+    ]
+    mace_paths = ffonons.io.glob_ph_docs(str(tmp_path), glob_patt="*-mace.json.*")
+    assert [*map(Path, mace_paths)] == [tmp_path / "mp-1-X-mace.json.xz"]
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("data/mp/mp-149-Si2-pbe.json.xz", ("mp-149", "Si2", "pbe")),
+        (
+            "/abs/phonon-db/mp-661-Al2N2-mace-y7uhwpje.json.zst",
+            ("mp-661", "Al2N2", "mace-y7uhwpje"),
+        ),
+        (
+            "mp-2789-N12O24-chgnet-v0.3.0.json.gz",
+            ("mp-2789", "N12O24", "chgnet-v0.3.0"),
+        ),
+        ("mp-1-mp-2/mp-3-NaCl-pbe.json", ("mp-3", "NaCl", "pbe")),
+    ],
+)
+def test_ph_doc_path_regex(path: str, expected: tuple[str, str, str]) -> None:
+    assert ffonons.io.PH_DOC_PATH_REGEX.search(path).groups() == expected
+
+
+@pytest.mark.parametrize("ext", ["gz", "xz", "zst"])
+def test_update_key_name(mock_data_dir: Path, ext: str) -> None:
     test_dir = mock_data_dir / "test_update"
     test_dir.mkdir()
-    (test_dir / "test_file.json.gz").touch()
+    doc_path = f"{test_dir}/mp-1-X-pbe.json.{ext}"
+    if ext == "zst":
+        ffonons.io.save_json_zst({"old_key": "value"}, doc_path)
+    else:
+        with zopen(doc_path, mode="wt") as file:
+            json.dump({"old_key": "value"}, file)
 
-    with (
-        patch("ffonons.io.json.load") as mock_json_load,
-        patch("ffonons.io.json.dump") as mock_json_dump,
-    ):
-        mock_json_load.return_value = {"old_key": "value"}
-        ffonons.io.update_key_name(str(test_dir), {"old_key": "new_key"})
+    ffonons.io.update_key_name(str(test_dir), {"old_key": "new_key"})
+
+    assert ffonons.io.load_json(doc_path) == {"new_key": "value"}
+
+
+def test_update_key_name_prefers_zst(tmp_path: Path) -> None:
+    # after convert_docs_to_zstd(remove_old=False), the loaders read the .zst copy
+    xz_path, zst_path = (f"{tmp_path}/mp-1-X-pbe.json.{ext}" for ext in ("xz", "zst"))
+    with zopen(xz_path, mode="wt") as file:
+        json.dump({"old_key": "value"}, file)
+    ffonons.io.save_json_zst({"old_key": "value"}, zst_path)
+
+    ffonons.io.update_key_name(str(tmp_path), {"old_key": "new_key"})
 
-    mock_json_dump.assert_called_once()
-    args, _ = mock_json_dump.call_args
-    assert "new_key" in args[0]
-    assert "old_key" not in args[0]
+    assert ffonons.io.load_json(zst_path) == {"new_key": "value"}
 
 
 def test_get_df_summary(mock_phonon_docs: dict[str, dict[str, PhononBSDOSDoc]]) -> None:
@@ -2,6 +2,7 @@ import pandas as pd
 import pytest
 from pandas import DataFrame
 from pymatviz.enums import Key
+from sklearn.metrics import accuracy_score, confusion_matrix, roc_auc_score
 
 from ffonons.enums import Model, PhKey
 from ffonons.metrics import get_df_metrics
@@ -62,6 +63,25 @@ def test_get_df_metrics_classification_metrics() -> None:
         assert 0 <= df_out.loc[model, "ROC AUC"] <= 1
 
 
+@pytest.mark.parametrize("model", [Model.mace_mp0, Model.chgnet_030])
+def test_get_df_metrics_classification_matches_sklearn(model: Model) -> None:
+    df_out = get_df_metrics(df_preds_mock)
+
+    y_pred = df_preds_mock.xs(model, level=1)[Key.has_imag_ph_modes].astype(bool)
+    y_true = df_preds_mock.xs(Key.pbe, level=1)[Key.has_imag_ph_modes]
+    y_true = y_true.loc[y_pred.index].astype(bool)
+    (_tn, fpr), (fnr, _tp) = confusion_matrix(y_true, y_pred, normalize="true")
+
+    expected = {
+        "FPR": fpr,
+        "FNR": fnr,
+        "Acc.": accuracy_score(y_true, y_pred),
+        "ROC AUC": roc_auc_score(y_true, y_pred),
+    }
+    for metric, val in expected.items():
+        assert df_out.loc[model.label, metric] == pytest.approx(val, abs=1e-3)
+
+
 def test_get_df_metrics_sorting() -> None:
     df_out = get_df_metrics(df_preds_mock)
 
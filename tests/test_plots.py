@@ -1,4 +1,11 @@
-from ffonons.plots import plotly_title
+import matplotlib.pyplot as plt
+import pytest
+from matplotlib.collections import LineCollection
+from pymatgen.phonon import PhononBandStructureSymmLine
+
+from ffonons import TEST_FILES
+from ffonons.io import load_json
+from ffonons.plots import plot_phonon_bands_mpl, plotly_title
 
 
 def test_plotly_title() -> None:
@@ -11,3 +18,52 @@ def test_plotly_title() -> None:
         'Fe<sub>2</sub>O<sub>3</sub>  <a href="https://example.com">example.com</a>'
     )
     assert plotly_title("Fe2O3", "https://example.com") == random_url_title
+
+
+def test_plot_phonon_bands_mpl() -> None:
+    doc = load_json(f"{TEST_FILES}/phonondb/mp-2789-N12O24-pbe.json.xz")
+    band_struct = PhononBandStructureSymmLine.from_dict(doc["phonon_bandstructure"])
+
+    _, ax = plt.subplots()
+    ax = plot_phonon_bands_mpl(
+        {"PBE": band_struct, "ML": band_struct},
+        ax=ax,
+        per_line_kwargs={"ML": dict(linestyles="dashed")},
+    )
+
+    band_collections = [
+        coll for coll in ax.collections if coll.get_label() in ("PBE", "ML")
+    ]
+    assert len(band_collections) == 2
+    n_segments = band_struct.nb_bands * len(band_struct.branches)
+    assert all(len(coll.get_segments()) == n_segments for coll in band_collections)
+    assert all(isinstance(coll, LineCollection) for coll in band_collections)
+    pbe_coll, ml_coll = band_collections
+    assert pbe_coll.get_linestyle() != ml_coll.get_linestyle()
+
+    tick_labels = [label.get_text() for label in ax.get_xticklabels()]
+    assert tick_labels[0] == "Γ"
+    assert "|" in "".join(tick_labels)  # path discontinuity labels merged
+    assert ax.get_legend() is not None
+    assert ax.get_xlim() == (band_struct.distance[0], band_struct.distance[-1])
+    plt.close("all")
+
+
+def test_plot_phonon_bands_mpl_incompatible() -> None:
+    doc = load_json(f"{TEST_FILES}/phonondb/mp-2789-N12O24-pbe.json.xz")
+    band_struct = PhononBandStructureSymmLine.from_dict(doc["phonon_bandstructure"])
+    bs_dict = doc["phonon_bandstructure"]
+    # drop the last q-point to mimic a band structure computed on a different path
+    truncated = PhononBandStructureSymmLine.from_dict(
+        bs_dict
+        | dict(
+            qpoints=bs_dict["qpoints"][:-1],
+            bands=[band[:-1] for band in bs_dict["bands"]],
+        )
+    )
+
+    _, ax = plt.subplots()
+    with pytest.raises(ValueError, match="'PBE' and 'ML' are incompatible"):
+        plot_phonon_bands_mpl({"PBE": band_struct, "ML": truncated}, ax=ax)
+    assert len(ax.collections) == 0
+    plt.close("all")